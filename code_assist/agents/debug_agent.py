@@ -488,6 +488,7 @@ Analyzes test failures and generates corrected code using Gemini
 """
 
 import os
+import re
 import json
 from pathlib import Path
 from typing import Dict, List, Any, Optional
@@ -501,6 +502,9 @@ from utils.gemini_client import GeminiClient
 
 console = Console()
 
+# Leftover opening and closing markdown fences around extracted code, stripped in a single pass
+CODE_FENCE_RE = re.compile(r'^\s*```.*?\n|```\s*$')
+
 class DebugAgent:
     """Agent responsible for analyzing bugs and suggesting fixes"""
 
@@ -799,8 +803,6 @@ class DebugAgent:
 
     def _extract_fixed_code(self, response_text: str, language: str) -> str:
         """Extract the fixed code from Gemini's response"""
-        import re
-
         patterns = [
             rf'```{language}\n(.*?)```',
             r'```\n(.*?)```',
@@ -811,8 +813,7 @@ class DebugAgent:
             matches = re.findall(pattern, response_text, re.DOTALL)
             if matches:
                 code = matches[0].strip()
-                code = re.sub(r'^\s*```.*?\n', '', code)
-                code = re.sub(r'```\s*$', '', code)
+                code = CODE_FENCE_RE.sub('', code)
                 return code.strip()
 
         return ""
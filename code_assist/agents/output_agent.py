@@ -445,27 +445,6 @@ class OutputAgent:
        
         
     
-    def _display_refactoring_results(self, results: Dict[str, Any]) -> None:
-        """Display refactoring service results"""
-        self.console.print("[bold green]🔧 Refactoring Results[/bold green]")
-        
-        refactor_table = Table(title="Refactoring Summary", border_style="green")
-        refactor_table.add_column("Metric", style="cyan")
-        refactor_table.add_column("Value", style="green")
-        
-        refactor_table.add_row("Files Refactored", str(results.get('files_refactored', 0)))
-        refactor_table.add_row("Issues Fixed", str(results.get('issues_fixed', 0)))
-        refactor_table.add_row("Code Quality Score", f"{results.get('quality_score', 0)}/100")
-        
-        self.console.print(refactor_table)
-        
-        # Display refactoring suggestions
-        suggestions = results.get('suggestions', [])
-        if suggestions:
-            self.console.print("\n[bold blue]💡 Refactoring Suggestions:[/bold blue]")
-            for i, suggestion in enumerate(suggestions, 1):
-                self.console.print(f"  {i}. {suggestion}")
-    
     def _display_debugging_results(self, results: Dict[str, Any]) -> None:
         """Display debugging service results"""
         self.console.print("[bold red]🐛 Debugging Results[/bold red]")
@@ -498,32 +477,6 @@ class OutputAgent:
                 )
                 self.console.print(bug_panel)
     
-    def _display_documentation_results(self, results: Dict[str, Any]) -> None:
-        """Display documentation service results"""
-        self.console.print("[bold blue]📚 Documentation Results[/bold blue]")
-        
-        docs_table = Table(title="Documentation Summary", border_style="blue")
-        docs_table.add_column("Metric", style="cyan")
-        docs_table.add_column("Value", style="green")
-        
-        docs_table.add_row("Files Documented", str(results.get('files_documented', 0)))
-        docs_table.add_row("Documentation Coverage", f"{results.get('coverage', 0)}%")
-        docs_table.add_row("Generated Docs", str(results.get('docs_generated', 0)))
-        
-        self.console.print(docs_table)
-        
-        # Display generated documentation files
-        doc_files = results.get('documentation_files', [])
-        if doc_files:
-            self.console.print("\n[bold blue]📄 Generated Documentation:[/bold blue]")
-            
-            docs_tree = Tree("📁 Documentation Files")
-            for doc_file in doc_files:
-                file_path = Path(doc_file)
-                docs_tree.add(f"📄 {file_path.name}")
-            
-            self.console.print(docs_tree)
-    
     def _display_analysis_results(self, results: Dict[str, Any]) -> None:
         """Display code analysis results"""
         self.console.print("[bold green]📊 Code Analysis Results[/bold green]")
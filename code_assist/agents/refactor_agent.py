@@ -22,6 +22,9 @@ from utils.gemini_client import GeminiClient
 
 console = Console()
 
+# Leftover opening and closing markdown fences around extracted code, stripped in a single pass
+CODE_FENCE_RE = re.compile(r'^\s*```.*?\n|```\s*$')
+
 
 class CodeSmellType(Enum):
     """Enumeration of code smell types"""
@@ -687,8 +690,7 @@ Provide clean, optimized, production-ready code following best practices."""
                     code = max(matches, key=len).strip()
                     
                     # Clean up markdown artifacts
-                    code = re.sub(r'^\s*```.*?\n', '', code)
-                    code = re.sub(r'```\s*$', '', code)
+                    code = CODE_FENCE_RE.sub('', code)
                     
                     return code.strip()
             
@@ -549,7 +549,7 @@ class JestRunner:
     """Jest test runner - runs tests directly like PyTest runner"""
 
     def __init__(self):
-        self.console = Console()
+        self.console = console
         node_path = r"C:\Program Files\nodejs"
         os.environ["PATH"] = node_path + os.pathsep + os.environ["PATH"]
         # code_assist/agents/runners => go 2 levels up to code_assist/
@@ -7,23 +7,51 @@ import subprocess
 import json
 import re
 import os
+import logging
 import shutil
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from rich.console import Console
 
 console = Console()
 
+# Tool probe chatter goes through logging so it costs nothing unless verbose output is requested
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+# Executables the runner shells out to; resolved once per runner instance
+JAVA_TOOLS = ('java', 'javac', 'mvn', 'gradle')
+
+# Maven Surefire summary patterns, compiled once and tried in priority order
+MAVEN_SUMMARY_PATTERNS = [
+    (re.compile(r'Tests run: (\d+), Failures: (\d+), Errors: (\d+), Skipped: (\d+)'), 'surefire'),
+    (re.compile(r'Tests: (\d+), Failures: (\d+), Errors: (\d+), Skipped: (\d+)'), 'alternative'),
+    (re.compile(r'(\d+) tests completed, (\d+) failed'), 'simple')
+]
+
 class JunitRunner:
     """Enhanced runner for executing Java tests with multiple strategies"""
     
-    def __init__(self):
-        self.console = Console()
-        self.java_available = self._check_java_available()
-        self.javac_available = self._check_javac_available()
-        self.maven_available = self._check_maven_available()
-        self.gradle_available = self._check_gradle_available()
+    def __init__(self, verbose: bool = False):
+        self.console = console
+        if verbose:
+            self._enable_verbose_logging()
+        # Resolve absolute tool paths up front so each subprocess call skips the PATH walk
+        self._bins = {tool: shutil.which(tool) for tool in JAVA_TOOLS}
+        
+        # Run the tool probes side by side; each one mostly waits on a JVM start-up
+        with ThreadPoolExecutor(max_workers=len(JAVA_TOOLS)) as pool:
+            java_probe = pool.submit(self._check_java_available)
+            javac_probe = pool.submit(self._check_javac_available)
+            maven_probe = pool.submit(self._check_maven_available)
+            gradle_probe = pool.submit(self._check_gradle_available)
+        
+        self.java_available = java_probe.result()
+        self.javac_available = javac_probe.result()
+        self.maven_available = maven_probe.result()
+        self.gradle_available = gradle_probe.result()
         
         # Multiple execution strategies
         self.execution_strategies = [
@@ -33,6 +61,14 @@ class JunitRunner:
             self._run_basic_compilation_check
         ]
     
+    def _enable_verbose_logging(self):
+        """Surface tool probe messages through Rich"""
+        from rich.logging import RichHandler
+        
+        if not any(isinstance(handler, RichHandler) for handler in log.handlers):
+            log.addHandler(RichHandler(console=console, show_path=False))
+        log.setLevel(logging.DEBUG)
+    
     def run_tests(self, test_file_path: str) -> Dict[str, Any]:
         """Execute Java tests using the best available method"""
         console.print(f"[cyan]🧪 Running Java tests: {Path(test_file_path).name}[/cyan]")
@@ -65,57 +101,68 @@ class JunitRunner:
     
     def _check_java_available(self) -> bool:
         """Check if Java is installed and available"""
+        if not self._bins['java']:
+            log.debug("Java not available")
+            return False
         try:
-            result = subprocess.run(['java', '-version'], 
+            result = subprocess.run([self._bins['java'], '-version'], 
                                   capture_output=True, text=True, timeout=5)
             available = result.returncode == 0
-            if available:
-                version_line = result.stderr.split('\n')[0] if result.stderr else result.stdout.split('\n')[0]
-                console.print(f"[green]✅ Java available: {version_line}[/green]")
-            else:
-                console.print("[yellow]⚠️ Java not available[/yellow]")
+            if available and log.isEnabledFor(logging.DEBUG):
+                log.debug("Java available: %s", (result.stderr or result.stdout).split('\n', 1)[0])
+            elif not available:
+                log.debug("Java not available")
             return available
         except Exception as e:
-            console.print(f"[yellow]⚠️ Could not check Java: {e}[/yellow]")
+            log.debug("Could not check Java: %s", e)
             return False
     
     def _check_javac_available(self) -> bool:
         """Check if Java compiler is available"""
+        if not self._bins['javac']:
+            log.debug("Java compiler not available")
+            return False
         try:
-            result = subprocess.run(['javac', '-version'], 
+            result = subprocess.run([self._bins['javac'], '-version'], 
                                   capture_output=True, text=True, timeout=5)
             available = result.returncode == 0
             if available:
-                console.print("[green]✅ Java compiler available[/green]")
+                log.debug("Java compiler available")
             return available
         except:
-            console.print("[yellow]⚠️ Java compiler not available[/yellow]")
+            log.debug("Java compiler not available")
             return False
     
     def _check_maven_available(self) -> bool:
         """Check if Maven is available"""
+        if not self._bins['mvn']:
+            log.debug("Maven not available")
+            return False
         try:
-            result = subprocess.run(['mvn', '--version'], 
+            result = subprocess.run([self._bins['mvn'], '--version'], 
                                   capture_output=True, text=True, timeout=10)
             available = result.returncode == 0
             if available:
-                console.print("[green]✅ Maven available[/green]")
+                log.debug("Maven available")
             return available
         except Exception:
-            console.print("[yellow]⚠️ Maven not available[/yellow]")
+            log.debug("Maven not available")
             return False
     
     def _check_gradle_available(self) -> bool:
         """Check if Gradle is available"""
+        if not self._bins['gradle']:
+            log.debug("Gradle not available")
+            return False
         try:
-            result = subprocess.run(['gradle', '--version'], 
+            result = subprocess.run([self._bins['gradle'], '--version'], 
                                   capture_output=True, text=True, timeout=10)
             available = result.returncode == 0
             if available:
-                console.print("[green]✅ Gradle available[/green]")
+                log.debug("Gradle available")
             return available
         except Exception:
-            console.print("[yellow]⚠️ Gradle not available[/yellow]")
+            log.debug("Gradle not available")
             return False
     
     def _run_with_junit_direct(self, test_file_path: str) -> Dict[str, Any]:
@@ -169,7 +216,7 @@ class JunitRunner:
             console.print("[dim]Running Maven test...[/dim]")
             
             # Run Maven test with timeout
-            result = subprocess.run(['mvn', 'test', '-q'], 
+            result = subprocess.run([self._bins['mvn'], 'test', '-q'], 
                                   capture_output=True, 
                                   text=True,
                                   timeout=120,
@@ -203,7 +250,7 @@ class JunitRunner:
             console.print("[dim]Running Gradle test...[/dim]")
             
             # Run Gradle test
-            result = subprocess.run(['gradle', 'test', '--info'], 
+            result = subprocess.run([self._bins['gradle'], 'test', '--info'], 
                                   capture_output=True, 
                                   text=True,
                                   timeout=120,
@@ -228,7 +275,7 @@ class JunitRunner:
                 return self._analyze_java_test_structure(test_file_path)
             
             # Try to compile the Java file
-            result = subprocess.run(['javac', test_file_path], 
+            result = subprocess.run([self._bins['javac'], test_file_path], 
                                   capture_output=True, 
                                   text=True,
                                   timeout=30,
@@ -314,7 +361,7 @@ class JunitRunner:
         try:
             classpath = ":".join(str(jar) for jar in junit_jars)
             
-            cmd = ['javac', '-cp', classpath, test_file_path]
+            cmd = [self._bins['javac'], '-cp', classpath, test_file_path]
             
             console.print(f"[dim]Compiling: {' '.join(cmd)}[/dim]")
             
@@ -353,7 +400,7 @@ class JunitRunner:
             if console_jar:
                 # Use JUnit Platform Console Launcher
                 cmd = [
-                    'java', '-jar', str(console_jar),
+                    self._bins['java'], '-jar', str(console_jar),
                     '--class-path', str(test_dir),
                     '--select-class', test_class
                 ]
@@ -361,7 +408,7 @@ class JunitRunner:
                 # Fallback to direct execution
                 classpath = ":".join(str(jar) for jar in junit_jars) + ":" + str(test_dir)
                 cmd = [
-                    'java', '-cp', classpath,
+                    self._bins['java'], '-cp', classpath,
                     'org.junit.platform.console.ConsoleLauncher',
                     '--select-class', test_class
                 ]
@@ -617,14 +664,8 @@ java {
         
         try:
             # Look for Maven Surefire test results
-            patterns = [
-                (r'Tests run: (\d+), Failures: (\d+), Errors: (\d+), Skipped: (\d+)', 'surefire'),
-                (r'Tests: (\d+), Failures: (\d+), Errors: (\d+), Skipped: (\d+)', 'alternative'),
-                (r'(\d+) tests completed, (\d+) failed', 'simple')
-            ]
-            
-            for pattern, pattern_type in patterns:
-                match = re.search(pattern, output)
+            for pattern, pattern_type in MAVEN_SUMMARY_PATTERNS:
+                match = pattern.search(output)
                 if match:
                     if pattern_type == 'surefire' or pattern_type == 'alternative':
                         tests_run = int(match.group(1))
@@ -687,15 +728,7 @@ java {
                 }
             
             # Default fallback
-            return {
-                'success': result.returncode == 0,
-                'passed': 1 if result.returncode == 0 else 0,
-                'failed': 0 if result.returncode == 0 else 1,
-                'skipped': 0,
-                'test_file': test_file_path,
-                'method': 'maven_fallback',
-                'output': output
-            }
+            return self._returncode_result(result, test_file_path, 'maven_fallback', output)
             
         except Exception as e:
             return {
@@ -750,15 +783,7 @@ java {
                         }
             
             # Fallback
-            return {
-                'success': result.returncode == 0,
-                'passed': 1 if result.returncode == 0 else 0,
-                'failed': 0 if result.returncode == 0 else 1,
-                'skipped': 0,
-                'test_file': test_file_path,
-                'method': 'gradle_fallback',
-                'output': output
-            }
+            return self._returncode_result(result, test_file_path, 'gradle_fallback', output)
             
         except Exception as e:
             return {
@@ -811,24 +836,8 @@ java {
                     }
             
             # If no specific patterns found, check for general success/failure
-            if result.returncode == 0:
-                return {
-                    'success': True,
-                    'passed': 1,
-                    'failed': 0,
-                    'test_file': test_file_path,
-                    'method': 'junit_console_success',
-                    'output': output
-                }
-            else:
-                return {
-                    'success': False,
-                    'passed': 0,
-                    'failed': 1,
-                    'test_file': test_file_path,
-                    'method': 'junit_console_failure',
-                    'output': output
-                }
+            method = 'junit_console_success' if result.returncode == 0 else 'junit_console_failure'
+            return self._returncode_result(result, test_file_path, method, output)
             
         except Exception as e:
             return {
@@ -837,6 +846,20 @@ java {
                 'output': output
             }
     
+    def _returncode_result(self, result: subprocess.CompletedProcess, test_file_path: str,
+                           method: str, output: str) -> Dict[str, Any]:
+        """Build the single pass/fail result used when no test summary could be parsed"""
+        ok = result.returncode == 0
+        return {
+            'success': ok,
+            'passed': 1 if ok else 0,
+            'failed': 0 if ok else 1,
+            'skipped': 0,
+            'test_file': test_file_path,
+            'method': method,
+            'output': output
+        }
+    
     def get_installation_instructions(self) -> Dict[str, Any]:
         """Get instructions for installing Java testing dependencies"""
         return {
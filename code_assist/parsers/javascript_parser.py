@@ -7,6 +7,9 @@ Specialized parser for JavaScript/TypeScript files
 from .base_parser import BaseParser
 import re
 
+# Control-flow keywords for complexity counting, found in one scan per line instead of one search each
+CONTROL_FLOW_RE = re.compile(r'\b(?:(?P<if_statements>if)|(?P<loops>for|while)|(?P<switch_statements>switch))\s*\(')
+
 class JavaScriptParser(BaseParser):
     """JavaScript/TypeScript-specific parser"""
     
@@ -354,15 +357,11 @@ class JavaScriptParser(BaseParser):
         for line in lines:
             stripped = line.strip()
             
-            # Control structures
-            if re.search(r'\bif\s*\(', stripped):
-                complexity['if_statements'] += 1
-            if re.search(r'\b(for|while)\s*\(', stripped):
-                complexity['loops'] += 1
+            # Control structures; each kind counts once per line however often it appears
+            for kind in {match.lastgroup for match in CONTROL_FLOW_RE.finditer(stripped)}:
+                complexity[kind] += 1
             if stripped.startswith('try'):
                 complexity['try_blocks'] += 1
-            if re.search(r'\bswitch\s*\(', stripped):
-                complexity['switch_statements'] += 1
             
             # Ternary operators
             if '?' in stripped and ':' in stripped:
@@ -46,6 +46,7 @@
 #             return None
 
 import os
+import hashlib
 from dotenv import load_dotenv
 from rich.console import Console
 import google.generativeai as genai
@@ -61,6 +62,8 @@ class GeminiClient:
     def __init__(self):
         self.client = None
         self.model = None
+        # Identifies the API key without exposing it, e.g. for caches that must not outlive a key change
+        self.key_fingerprint = ''
         self._initialize()
 
     def _initialize(self):
@@ -68,6 +71,7 @@ class GeminiClient:
         if not api_key:
             console.print("[yellow]⚠️ GEMINI_API_KEY not set in .env file[/yellow]")
             return
+        self.key_fingerprint = hashlib.sha256(api_key.encode()).hexdigest()[:16]
 
         try:
             # ✅ FIX: Use google.generativeai instead of google.genai
@@ -101,21 +105,49 @@ class GeminiClient:
                 return None
                 
         except Exception as e:
-            console.print(f"[red]❌ Gemini generation failed: {e}[/red]")
-            
-            # Provide helpful error message
-            if "404" in str(e):
-                console.print("[yellow]💡 Tip: Model not found. Make sure you're using the correct SDK[/yellow]")
-                console.print("   Install: pip install google-generativeai")
-            elif "quota" in str(e).lower() or "limit" in str(e).lower():
-                console.print("[yellow]💡 Tip: API quota exceeded. Check your Gemini API usage[/yellow]")
-            elif "api key" in str(e).lower() or "401" in str(e) or "403" in str(e):
-                console.print("[yellow]💡 Tip: Invalid API key. Check GEMINI_API_KEY in .env[/yellow]")
-            elif "safety" in str(e).lower():
-                console.print("[yellow]💡 Tip: Content blocked by safety filters[/yellow]")
+            self._report_generation_error(e)
+            return None
+    
+    def generate_content_stream(self, prompt: str, should_stop=None):
+        """Generate content as a stream, stopping early once should_stop(newest chunk) is true"""
+        if not self.client or not self.model:
+            console.print("[yellow]⚠️ Gemini client not initialized[/yellow]")
+            return None
+        
+        try:
+            parts = []
+            for chunk in self.model.generate_content(prompt, stream=True):
+                parts.append(chunk.text)
+                # The rest of a reply that is already rejected is not worth waiting (and paying) for.
+                # Only the new chunk is passed, so a stateful check never rescans the whole reply
+                if should_stop and should_stop(chunk.text):
+                    break
             
+            text = ''.join(parts)
+            if text:
+                return LLMResponse(text)
+            console.print("[yellow]⚠️ Empty response from Gemini[/yellow]")
+            return None
+        
+        except Exception as e:
+            self._report_generation_error(e)
             return None
     
+    def _report_generation_error(self, e: Exception):
+        """Print a failed generation with a hint for the common causes"""
+        console.print(f"[red]❌ Gemini generation failed: {e}[/red]")
+        
+        # Provide helpful error message
+        if "404" in str(e):
+            console.print("[yellow]💡 Tip: Model not found. Make sure you're using the correct SDK[/yellow]")
+            console.print("   Install: pip install google-generativeai")
+        elif "quota" in str(e).lower() or "limit" in str(e).lower():
+            console.print("[yellow]💡 Tip: API quota exceeded. Check your Gemini API usage[/yellow]")
+        elif "api key" in str(e).lower() or "401" in str(e) or "403" in str(e):
+            console.print("[yellow]💡 Tip: Invalid API key. Check GEMINI_API_KEY in .env[/yellow]")
+        elif "safety" in str(e).lower():
+            console.print("[yellow]💡 Tip: Content blocked by safety filters[/yellow]")
+    
     def list_available_models(self):
         """List available Gemini models (for debugging)"""
         if not self.client:
@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The agents import each other rooted at code_assist/, as they do when the CLI runs
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'code_assist'))
+
+from agents.runners.pytest_runner import PytestRunner  # noqa: E402
+
+
+@pytest.fixture
+def runner():
+    runner = PytestRunner(parallel=False)
+    yield runner
+    runner.close()
+
+
+@pytest.fixture
+def write_test_file(tmp_path):
+    """Write a test module into a fresh directory and return its path as a string"""
+    def write(name, source):
+        path = tmp_path / name
+        path.write_text(source)
+        return str(path)
+    return write
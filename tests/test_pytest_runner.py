@@ -0,0 +1,276 @@
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from agents.runners.pytest_runner import _TestFileCtx
+
+CODE_ASSIST_DIR = Path(__file__).resolve().parent.parent / 'code_assist'
+
+HANGING_TEST = '''
+import time
+
+def test_hangs():
+    time.sleep(60)
+'''
+
+PASSING_TEST = '''
+def test_one():
+    assert 1 + 1 == 2
+
+def test_two():
+    assert 'a' * 2 == 'aa'
+'''
+
+MIXED_TEST = '''
+def test_passes():
+    assert [1, 2][-1] == 2
+
+def test_fails():
+    assert {}.get('key') == 'value'
+
+def test_raises():
+    raise ValueError('boom')
+'''
+
+PARAMETRIZED_TEST = '''
+import pytest
+
+@pytest.mark.parametrize('n', [1, 2, 3])
+def test_positive(n):
+    assert n > 0
+
+class TestGroup:
+    def test_member(self):
+        assert True
+'''
+
+THREE_PASSING_TEST = '''
+def test_a():
+    assert True
+
+def test_b():
+    assert True
+
+def test_c():
+    assert True
+'''
+
+
+def test_batch_with_hanging_file_returns(runner, write_test_file):
+    ok = write_test_file('test_ok.py', PASSING_TEST)
+    hang = write_test_file('test_hang.py', HANGING_TEST)
+
+    budget = 3
+    start = time.monotonic()
+    results = runner.run_tests_batch([ok, hang], time_budget=budget)
+    elapsed = time.monotonic() - start
+
+    # The session gets a budget per file; only the hanging file then runs again, with its own
+    assert elapsed < 3 * budget + 10
+    assert results[ok]['method'] == 'pytest_batch'
+    assert (results[ok]['passed'], results[ok]['failed']) == (2, 0)
+    assert results[hang]['passed'] == 0
+    assert not results[hang]['success']
+
+
+def _lingering_threads(before, grace=3.0):
+    """Threads started since `before` that are still alive once a short grace period has passed"""
+    deadline = time.monotonic() + grace
+    while True:
+        extra = [t for t in threading.enumerate() if t not in before and not t.daemon]
+        if not extra or time.monotonic() > deadline:
+            return extra
+        time.sleep(0.1)
+
+
+def test_hanging_test_returns_within_budget(runner, write_test_file):
+    hang = write_test_file('test_hang.py', HANGING_TEST)
+    before = set(threading.enumerate())
+
+    budget = 3
+    start = time.monotonic()
+    result = runner.run_tests(hang, time_budget=budget)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < budget + 2
+    assert not result['success']
+    assert result['passed'] == 0
+    assert _lingering_threads(before) == []
+
+
+def test_cache_misses_after_edit(runner, write_test_file):
+    path = write_test_file('test_edit.py', PASSING_TEST)
+
+    first = runner.run_tests(path)
+    assert (first['passed'], first['failed']) == (2, 0)
+    assert runner.run_tests(path).get('cached')
+
+    with open(path, 'a') as f:
+        f.write('\ndef test_three():\n    assert False\n')
+
+    edited = runner.run_tests(path)
+    assert not edited.get('cached')
+    assert (edited['passed'], edited['failed']) == (2, 1)
+
+
+def test_batch_counts_per_file(runner, write_test_file):
+    ok = write_test_file('test_ok.py', PASSING_TEST)
+    mixed = write_test_file('test_mixed.py', MIXED_TEST)
+
+    results = runner.run_tests_batch([ok, mixed])
+
+    assert (results[ok]['passed'], results[ok]['failed']) == (2, 0)
+    assert (results[mixed]['passed'], results[mixed]['failed']) == (1, 2)
+
+
+def test_count_tests_expands_parametrize(runner, write_test_file):
+    path = write_test_file('test_params.py', PARAMETRIZED_TEST)
+
+    # Three parametrized cases plus a test method; the AST count would see two functions
+    assert runner.count_tests(path) == 4
+
+
+def test_daemon_ignores_replies_of_timed_out_runs(runner, write_test_file):
+    alpha = write_test_file('test_alpha.py', THREE_PASSING_TEST)
+    beta = write_test_file('test_beta.py', PASSING_TEST)
+    daemon = runner._get_daemon()
+
+    # Gives up while the daemon is still importing pytest, before alpha's worker has even started
+    with pytest.raises(subprocess.TimeoutExpired):
+        daemon.run([alpha, '-q'], timeout=0.01)
+
+    reply = daemon.run([beta, '-q'], timeout=30)
+    assert {test['nodeid'].split('::')[0] for test in reply['report']['tests']} == {'test_beta.py'}
+    assert reply['report']['summary']['passed'] == 2
+
+
+def test_run_after_timeout_reports_its_own_file(runner, write_test_file):
+    hang = write_test_file('test_hang.py', HANGING_TEST)
+    beta = write_test_file('test_beta.py', PASSING_TEST)
+
+    assert runner.run_tests(hang, time_budget=2)['passed'] == 0
+
+    result = runner.run_tests(beta)
+    assert (result['passed'], result['failed']) == (2, 0)
+    assert 'test_hang' not in result['output']
+    assert runner.run_tests(beta)['passed'] == 2
+
+
+def test_tests_run_once_per_call(runner, write_test_file, tmp_path):
+    log = tmp_path / 'runs.log'
+    path = write_test_file('test_side_effect.py', f'''
+import os
+
+def test_logs_pid():
+    with open({str(log)!r}, 'a') as f:
+        f.write(f'{{os.getpid()}}\\n')
+''')
+
+    result = runner.run_tests(path)
+
+    assert result['passed'] == 1
+    assert len(log.read_text().splitlines()) == 1
+
+
+def _process_gone(pid, grace=3.0):
+    """Whether pid has exited (an unreaped zombie counts) within a short grace period"""
+    deadline = time.monotonic() + grace
+    while True:
+        try:
+            with open(f'/proc/{pid}/stat') as f:
+                if f.read().rsplit(')', 1)[1].split()[0] == 'Z':
+                    return True
+        except FileNotFoundError:
+            return True
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.1)
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='reads /proc')
+def test_deadline_reaps_processes_spawned_by_tests(runner, write_test_file, tmp_path):
+    pid_file = tmp_path / 'child.pid'
+    path = write_test_file('test_spawns.py', f'''
+import subprocess
+import sys
+import time
+
+def test_spawns_and_hangs():
+    child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+    with open({str(pid_file)!r}, 'w') as f:
+        f.write(str(child.pid))
+    time.sleep(60)
+''')
+
+    runner.run_tests(path, time_budget=3)
+
+    assert _process_gone(int(pid_file.read_text()))
+
+
+SLOW_TEST = '''
+import time
+
+def test_slow():
+    time.sleep(1.5)
+'''
+
+
+def test_batch_budget_scales_with_file_count(runner, write_test_file):
+    paths = [write_test_file(f'test_slow_{i}.py', SLOW_TEST) for i in range(3)]
+
+    # 4.5s in total: over one file's budget, within the three files' budgets together
+    results = runner.run_tests_batch(paths, time_budget=2)
+
+    assert all(results[path]['passed'] == 1 for path in paths)
+    assert all(results[path]['method'] == 'pytest_batch' for path in paths)
+
+
+def test_batch_deadline_keeps_finished_files(runner, write_test_file):
+    first = write_test_file('test_a_first.py', PASSING_TEST)
+    hang = write_test_file('test_b_hang.py', HANGING_TEST)
+    last = write_test_file('test_c_last.py', PASSING_TEST)
+
+    results = runner.run_tests_batch([first, hang, last], time_budget=2)
+
+    assert results[first]['method'] == 'pytest_batch'
+    assert results[first]['passed'] == 2
+    assert results[last]['method'] != 'pytest_batch'
+    assert results[last]['passed'] == 2
+    assert results[hang]['passed'] == 0
+
+
+def test_direct_execution_runs_in_a_daemon_fork(runner, write_test_file):
+    path = write_test_file('test_direct.py', MIXED_TEST)
+
+    result = runner._run_with_direct_execution(_TestFileCtx.from_path(path))
+
+    assert (result['passed'], result['failed']) == (1, 2)
+    assert runner._daemon is not None
+
+
+def test_direct_execution_leaves_callers_main_alone(tmp_path, write_test_file):
+    path = write_test_file('test_direct.py', PASSING_TEST)
+    log = tmp_path / 'driver.log'
+    driver = tmp_path / 'driver.py'
+    # Unguarded on purpose: a forkserver would run this module again in its workers
+    driver.write_text(f'''
+import sys
+sys.path.insert(0, {str(CODE_ASSIST_DIR)!r})
+with open({str(log)!r}, 'a') as f:
+    f.write('run\\n')
+
+from agents.runners.pytest_runner import PytestRunner, _TestFileCtx
+runner = PytestRunner()
+result = runner._run_with_direct_execution(_TestFileCtx.from_path({path!r}))
+runner.close()
+print('PASSED', result['passed'])
+''')
+
+    completed = subprocess.run([sys.executable, str(driver)], capture_output=True, text=True, timeout=60)
+
+    assert 'PASSED 2' in completed.stdout
+    assert log.read_text().splitlines() == ['run']